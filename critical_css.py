@@ -0,0 +1,446 @@
+import os
+import re
+import shutil
+import hashlib
+from html.parser import HTMLParser
+from pathlib import Path
+
+# ========== 核心路径配置（无需修改） ==========
+PROJECT_ROOT = Path(__file__).parent
+# 目标HTML文件：根目录下的step00.html~step29.html
+HTML_FILES = [PROJECT_ROOT / f"step{i:02d}.html" for i in range(30)]
+# 构建输出目录：处理后的页面写到这里，源页面（及其<style>）保持不变，可随时重新生成
+# 目录结构与项目根目录一致（页面 + index.html + assets/），可直接作为站点根目录发布
+BUILD_DIR = PROJECT_ROOT / "dist"
+# 站点中不需要处理的其余文件/目录：原样同步到BUILD_DIR（优先硬链接，不重复占用磁盘）
+STATIC_ENTRIES = ["index.html", "assets"]
+# 延迟加载的完整样式表输出目录（内容相同的页面共用同一个文件）
+CSS_DIR = BUILD_DIR / "assets" / "css"
+# 页面注释中存在非法UTF-8字节，读写时原样保留，避免改写页面时损坏内容
+HTML_ERRORS = "surrogateescape"
+# =============================================
+
+# 首屏区域：顶部导航、侧栏、步骤标题（含进度条/标题）、提示框
+CRITICAL_ROOTS = [
+    ("header", "top-nav"),
+    ("div", "sidebar"),
+    ("div", "step-header"),
+    ("div", "alert-box"),
+]
+# 首屏图片行：画廊中前N个图片框（桌面端一行最多3列）
+FIRST_ROW_ITEMS = 3
+# 交互状态样式不影响首次渲染，全部延迟加载
+INTERACTIVE_PSEUDO = re.compile(r':(hover|focus|focus-visible|focus-within|active|visited)\b')
+# 输出页面中关键CSS块的标记
+CRITICAL_MARKER = "data-critical"
+
+STYLE_BLOCK_PATTERN = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+# ===================== HTML：收集首屏元素 =====================
+class _Node:
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.classes = set((dict(attrs).get("class") or "").split())
+        self.id = dict(attrs).get("id")
+        self.parent = parent
+        self.children = []
+
+
+class _TreeBuilder(HTMLParser):
+    """用标准库html.parser构建简易DOM树（只保留标签/class/id）"""
+
+    def __init__(self):
+        super().__init__()
+        self.root = _Node("#document", [], None)
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, attrs, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(_Node(tag, attrs, self.current))
+
+    def handle_endtag(self, tag):
+        # 容错：向上回溯到匹配的开始标签
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+
+def _iter_nodes(node):
+    for child in node.children:
+        yield child
+        yield from _iter_nodes(child)
+
+
+def collect_above_fold_tokens(html_content: str) -> dict:
+    """收集首屏区域（及其祖先元素）用到的标签名/class/id"""
+    builder = _TreeBuilder()
+    builder.feed(html_content)
+    all_nodes = list(_iter_nodes(builder.root))
+
+    roots = [node for node in all_nodes
+             if any(node.tag == tag and cls in node.classes for tag, cls in CRITICAL_ROOTS)]
+    for gallery in (node for node in all_nodes if "image-gallery" in node.classes):
+        roots.append(gallery)
+        items = [child for child in gallery.children if "image-item" in child.classes]
+        roots.extend(items[:FIRST_ROW_ITEMS])
+
+    tokens = {"tags": set(), "classes": set(), "ids": set()}
+
+    def add(node):
+        tokens["tags"].add(node.tag)
+        tokens["classes"].update(node.classes)
+        if node.id:
+            tokens["ids"].add(node.id)
+
+    for root in roots:
+        # 画廊本身只取容器，图片框由FIRST_ROW_ITEMS单独计入
+        descendants = [] if "image-gallery" in root.classes else list(_iter_nodes(root))
+        for node in [root] + descendants:
+            add(node)
+        ancestor = root.parent
+        while ancestor is not None and ancestor is not builder.root:
+            add(ancestor)
+            ancestor = ancestor.parent
+    return tokens
+
+
+# ===================== CSS：解析/去重/提取 =====================
+def parse_css(css_text: str) -> list:
+    """
+    将CSS解析为规则列表：
+    - 普通规则：(选择器, 声明文本)
+    - 嵌套at规则（@media等）：(前导, 子规则列表)
+    """
+    css_text = re.sub(r'/\*.*?\*/', '', css_text, flags=re.DOTALL)
+    rules = []
+    pos = 0
+    while True:
+        open_idx = css_text.find("{", pos)
+        if open_idx == -1:
+            break
+        prelude = css_text[pos:open_idx]
+        # 前导中以;结尾的at语句（如@import）单独保留
+        *statements, prelude = prelude.split(";")
+        for statement in statements:
+            if statement.strip():
+                rules.append((_normalize_prelude(statement), None))
+
+        depth = 0
+        close_idx = open_idx
+        for close_idx in range(open_idx, len(css_text)):
+            if css_text[close_idx] == "{":
+                depth += 1
+            elif css_text[close_idx] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+        body = css_text[open_idx + 1:close_idx]
+        prelude = _normalize_prelude(prelude)
+        if prelude.startswith("@") and "{" in body:
+            rules.append((prelude, parse_css(body)))
+        else:
+            rules.append((prelude, _normalize_declarations(body)))
+        pos = close_idx + 1
+    return rules
+
+
+def _normalize_prelude(prelude: str) -> str:
+    prelude = " ".join(prelude.split())
+    return re.sub(r'\s*,\s*', ', ', prelude)
+
+
+def _normalize_declarations(body: str) -> str:
+    # 只合并空白，不按;拆分（避免破坏url(data:...;base64)等值）
+    return " ".join(body.split()).rstrip("; ")
+
+
+def serialize_css(rules: list, indent: str = "") -> str:
+    """将规则列表输出为CSS文本（每条规则一行）"""
+    lines = []
+    for prelude, body in rules:
+        if body is None:
+            lines.append(f"{indent}{prelude};")
+        elif isinstance(body, list):
+            lines.append(f"{indent}{prelude} {{")
+            lines.append(serialize_css(body, indent + "  "))
+            lines.append(f"{indent}}}")
+        else:
+            lines.append(f"{indent}{prelude} {{ {body} }}")
+    return "\n".join(lines)
+
+
+def dedupe_rules(rules: list) -> tuple:
+    """删除同一层级内完全相同的重复规则（保留最后一次出现，层叠结果不变），返回(规则, 删除数)"""
+    seen = set()
+    result = []
+    removed = 0
+    for prelude, body in reversed(rules):
+        if isinstance(body, list):
+            body, nested_removed = dedupe_rules(body)
+            removed += nested_removed
+        key = serialize_css([(prelude, body)])
+        if key in seen:
+            removed += 1
+            continue
+        seen.add(key)
+        result.append((prelude, body))
+    result.reverse()
+    return result, removed
+
+
+def selector_is_critical(selector: str, tokens: dict) -> bool:
+    """判断选择器是否可能命中首屏元素（按标签/class/id近似匹配）"""
+    if INTERACTIVE_PSEUDO.search(selector):
+        return False
+    selector = re.sub(r'::?[a-zA-Z-]+(\([^)]*\))?', '', selector)
+    selector = re.sub(r'\[[^\]]*\]', '', selector)
+    for compound in re.split(r'\s*[>+~]\s*|\s+', selector.strip()):
+        if not compound or compound == "*":
+            continue
+        tag = re.match(r'[a-zA-Z][a-zA-Z0-9-]*', compound)
+        if tag and tag.group(0).lower() not in tokens["tags"]:
+            return False
+        if any(cls not in tokens["classes"] for cls in re.findall(r'\.([\w-]+)', compound)):
+            return False
+        if any(id_ not in tokens["ids"] for id_ in re.findall(r'#([\w-]+)', compound)):
+            return False
+    return True
+
+
+def select_critical(rules: list, tokens: dict) -> list:
+    """提取首屏关键规则（@media内的关键规则保留原媒体查询）"""
+    critical = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            if prelude.startswith("@media"):
+                inner = select_critical(body, tokens)
+                if inner:
+                    critical.append((prelude, inner))
+        elif body is None or prelude.startswith("@"):
+            continue
+        elif any(selector_is_critical(s, tokens) for s in prelude.split(",")):
+            critical.append((prelude, body))
+    return critical
+
+
+# ===================== 页面处理 =====================
+def _link_or_copy(src, dst):
+    """同步单个文件：已是同一文件则跳过，否则优先硬链接，跨设备等情况退回复制"""
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return dst
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _write_output(path: Path, text: str):
+    """写入生成文件：先删除旧文件，避免改写到与源文件硬链接的同一份内容"""
+    if path.exists():
+        path.unlink()
+    with open(path, "w", encoding="utf-8", errors=HTML_ERRORS) as f:
+        f.write(text)
+
+
+def sync_static_files(dry_run: bool = False) -> int:
+    """将STATIC_ENTRIES同步到BUILD_DIR（页面中的相对链接因此无需改写），并删除源目录中已不存在的文件"""
+    synced = 0
+    for entry in STATIC_ENTRIES:
+        source = PROJECT_ROOT / entry
+        target = BUILD_DIR / entry
+        if not source.exists():
+            print(f"⚠ 跳过：{entry} 不存在")
+            continue
+        if source.is_file():
+            synced += 1
+            if not dry_run:
+                BUILD_DIR.mkdir(parents=True, exist_ok=True)
+                _link_or_copy(source, target)
+            continue
+
+        source_files = {path.relative_to(source) for path in source.rglob("*") if path.is_file()}
+        synced += len(source_files)
+        if dry_run:
+            continue
+        shutil.copytree(source, target, copy_function=_link_or_copy, dirs_exist_ok=True)
+        for path in list(target.rglob("*")):
+            # 本脚本生成的样式表不在源目录中，保留
+            if path.is_file() and CSS_DIR not in path.parents and path.relative_to(target) not in source_files:
+                path.unlink()
+    return synced
+
+
+def process_page(html_file: Path, dry_run: bool = False):
+    """
+    处理单个步骤页面（源页面只读，结果写入BUILD_DIR）：
+    1. 去重<style>内重复的规则块
+    2. 仅内联首屏关键CSS，完整样式表改为异步加载
+    返回统计信息（首屏CSS字节数：处理前/处理后），失败返回None
+    """
+    if not html_file.exists():
+        print(f"❌ 跳过：文件不存在 {html_file.name}")
+        return None
+
+    with open(html_file, "r", encoding="utf-8", errors=HTML_ERRORS) as f:
+        content = f.read()
+
+    style_match = STYLE_BLOCK_PATTERN.search(content)
+    if not style_match:
+        print(f"⚠ 跳过：{html_file.name} 未找到<style>")
+        return None
+
+    rules, removed = dedupe_rules(parse_css(style_match.group(1)))
+    full_css = serialize_css(rules) + "\n"
+    critical_css = serialize_css(select_critical(rules, collect_above_fold_tokens(content))) + "\n"
+
+    # 完整样式表按内容哈希命名，相同内容的页面共用一个文件（可被浏览器缓存）
+    css_name = f"step-{hashlib.sha256(full_css.encode('utf-8', HTML_ERRORS)).hexdigest()[:10]}.css"
+    css_href = f"{CSS_DIR.relative_to(BUILD_DIR).as_posix()}/{css_name}"
+    replacement = (
+        f"<style {CRITICAL_MARKER}>\n{critical_css}</style>\n"
+        f'  <link href="{css_href}" rel="preload" as="style" onload="this.onload=null;this.rel=\'stylesheet\'"/>\n'
+        f'  <noscript><link href="{css_href}" rel="stylesheet"/></noscript>'
+    )
+
+    stats = {
+        "file": html_file.name,
+        "before_bytes": len(style_match.group(1).encode("utf-8", HTML_ERRORS)),
+        "after_bytes": len(critical_css.encode("utf-8", HTML_ERRORS)),
+        "deduped_rules": removed,
+        "stylesheet": css_href,
+        "output": str(BUILD_DIR / html_file.name),
+    }
+    if dry_run:
+        return stats
+
+    CSS_DIR.mkdir(parents=True, exist_ok=True)
+    _write_output(CSS_DIR / css_name, full_css)
+    content = content[:style_match.start()] + replacement + content[style_match.end():]
+    _write_output(BUILD_DIR / html_file.name, content)
+    return stats
+
+
+def main(dry_run: bool = False):
+    print("===== 开始内联首屏关键CSS（其余样式异步加载） =====")
+    results = []
+
+    for html_file in HTML_FILES:
+        stats = process_page(html_file, dry_run=dry_run)
+        if stats:
+            results.append(stats)
+            print(f"✅ {stats['file']}：首屏CSS {stats['before_bytes'] / 1024:.1f} KB → "
+                  f"{stats['after_bytes'] / 1024:.1f} KB，去重 {stats['deduped_rules']} 条规则")
+        elif html_file.exists() and not dry_run:
+            # 未能处理的页面原样输出，保证BUILD_DIR中的页面链接完整
+            BUILD_DIR.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(html_file, BUILD_DIR / html_file.name)
+    static_count = sync_static_files(dry_run=dry_run)
+
+    before_total = sum(s["before_bytes"] for s in results)
+    after_total = sum(s["after_bytes"] for s in results)
+    # 清理上次构建遗留、本次未再使用的样式表
+    if not dry_run and CSS_DIR.exists():
+        used_names = {Path(s["stylesheet"]).name for s in results}
+        for stale in CSS_DIR.glob("step-*.css"):
+            if stale.name not in used_names:
+                stale.unlink()
+
+    print(f"\n===== 处理完成：{len(results)}/{len(HTML_FILES)} 个页面（输出目录：{BUILD_DIR}） =====")
+    print(f"📁 同步站点文件：{static_count} 个（{', '.join(STATIC_ENTRIES)}），发布时以 {BUILD_DIR.name}/ 为站点根目录")
+    if results:
+        print(f"📊 首屏CSS合计：{before_total / 1024:.1f} KB → {after_total / 1024:.1f} KB"
+              f"（减少 {(1 - after_total / before_total) * 100:.1f}%）")
+        print(f"📊 共用样式表：{len({s['stylesheet'] for s in results})} 个")
+    return results
+
+
+# ===================== 测试用例 =====================
+def test_parse_css():
+    """测试CSS解析：嵌套@media/@supports、@import语句、注释、data URI中的;"""
+    css = """
+    @import url("print.css");
+    /* 注释 { 不影响解析 } */
+    .icon { background: url(data:image/png;base64,iVBORw0KGgo=) no-repeat;  width : 16px; }
+    @media (max-width: 768px) {
+      .sidebar { display: none; }
+      @supports (display: grid) {
+        .image-gallery { display: grid; }
+      }
+    }
+    """
+    rules = parse_css(css)
+    assert rules[0] == ('@import url("print.css")', None), rules[0]
+    # 声明只合并空白，不在data URI的;处拆分
+    assert rules[1] == (".icon", "background: url(data:image/png;base64,iVBORw0KGgo=) no-repeat; width : 16px"), rules[1]
+    media_prelude, media_body = rules[2]
+    assert media_prelude == "@media (max-width: 768px)"
+    assert media_body[0] == (".sidebar", "display: none")
+    assert media_body[1] == ("@supports (display: grid)", [(".image-gallery", "display: grid")])
+    # 序列化后再解析，结果不变
+    assert parse_css(serialize_css(rules)) == rules
+    print("\n=== CSS解析测试通过 ===")
+
+
+def test_dedupe_rules():
+    """测试去重：保留最后一次出现的重复规则（保证层叠顺序不变），@media内部单独去重"""
+    rules = parse_css("""
+    .a { color: red }
+    .b { color: blue }
+    .a { color: red }
+    @media (max-width: 768px) { .a { color: red } .a { color: red } }
+    """)
+    deduped, removed = dedupe_rules(rules)
+    assert removed == 2, removed
+    # 同时带有a、b两个class的元素原本显示红色（最后的.a生效）；若保留第一次出现则会变成蓝色
+    assert deduped[:2] == [(".b", "color: blue"), (".a", "color: red")], deduped
+    # @media内的规则与外层相同，但作用条件不同，不能跨层级删除
+    assert deduped[2] == ("@media (max-width: 768px)", [(".a", "color: red")]), deduped[2]
+    print("\n=== CSS去重测试通过 ===")
+
+
+def test_select_critical():
+    """测试首屏规则提取：交互状态延迟加载，伪元素保留，@media只保留关键子规则"""
+    tokens = collect_above_fold_tokens(
+        '<body><header class="top-nav"><a class="logo" href="index.html">SENS_HAND</a></header>'
+        '<footer class="footer"><p>footer</p></footer></body>'
+    )
+    assert selector_is_critical(".top-nav .logo", tokens)
+    assert selector_is_critical("body > header.top-nav::before", tokens)
+    assert not selector_is_critical(".top-nav .logo:hover", tokens)
+    assert not selector_is_critical("a:focus-visible", tokens)
+    # footer不在首屏区域内
+    assert not selector_is_critical(".footer p", tokens)
+
+    rules = parse_css("""
+    .top-nav { position: sticky }
+    .top-nav a:hover { color: red }
+    @media (max-width: 768px) { .top-nav { padding: 0 } .footer { margin: 0 } }
+    @media print { .footer { display: none } }
+    @font-face { font-family: x; src: url(x.woff2) }
+    """)
+    assert select_critical(rules, tokens) == [
+        (".top-nav", "position: sticky"),
+        ("@media (max-width: 768px)", [(".top-nav", "padding: 0")]),
+    ]
+    print("\n=== 首屏CSS提取测试通过 ===")
+
+
+if __name__ == "__main__":
+    # 先运行测试用例验证CSS解析/去重/首屏提取
+    test_parse_css()
+    test_dedupe_rules()
+    test_select_critical()
+
+    main()
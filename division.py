@@ -1,11 +1,146 @@
+import hashlib
+import json
+import os
 import re
 
-def process_robot_hand_instructions(file_path):
+# ========== 润色缓存配置 ==========
+# 缓存文件（隐藏文件，与脚本同目录）
+POLISH_CACHE_FILE = os.path.join(os.path.abspath(os.path.dirname(__file__)), ".polish_cache.json")
+# 缓存条目上限：超出后按最近最少使用（LRU）淘汰
+POLISH_CACHE_MAX_ENTRIES = 5000
+# 缓存格式版本：键/值的生成方式变化时递增，使旧缓存整体失效
+POLISH_CACHE_FORMAT = 2
+
+# ========== 专业语言润色规则 ==========
+# 修改规则后，规则集版本号随之变化，旧缓存自动失效
+POLISH_RULES = {
+    # 拼写错误修正
+    r'scrwews\b': 'screws',
+    r'thay\b': 'they',
+    # 口语化表达→专业表达
+    r'wiggling it around while pushing it in can help': 'gently wiggle and push the tube to facilitate insertion',
+    r'It might be easier to first': 'It is recommended to first',
+    r'Press firmly': 'Apply firm pressure',
+    r'pull them and bring the carpal on to': 'pull the tendons taut and mount the carpal onto',
+    r'significant amount of tension': 'sufficient tension',
+    r'tighten very securely': 'tighten the fastener securely to specification',
+    r'trying to apply tension later will be significantly harder': 'subsequent tension adjustment will be substantially more difficult',
+    # 专业术语标准化
+    r'teflon tubing\b': 'PTFE tubing',
+    r'finger assembly\b': 'finger subassembly',
+    r'carpal holes\b': 'carpal apertures',
+    r'tower holes\b': 'tower bores',
+    r'rod\b': 'guide rod',
+    r'washers\b': 'flat washers',
+    r'groove\b': 'machined groove',
+    r'motor teeth\b': 'motor gear teeth',
+    r'belt\b(?![^\S\n]+sanitizer)': 'timing belt',  # 避免误匹配其他belt（仅检查同一行，保证可逐行润色）
+    r'wrist gear\b': 'wrist drive gear',
+    r'bearing covers\b': 'bearing retainer plates',
+    # 关键步骤优化
+    r'Follow the color coding to route the tendons through the carpal holes\. They should not cross each other': 
+    'Route the tendons through the carpal apertures in accordance with the color-coding scheme; ensure no tendon crossover occurs',
+    r'Note: The holes the tendons come out from at the other side of the carpal may appear random due to internal routing':
+    'Note: The exit apertures of the tendons on the distal side of the carpal may appear irregular due to internal routing paths',
+    r'Be extra careful with the routing as it\'s not as straightforward as the other fingers':
+    'Exercise additional caution during tendon routing, as this process is less intuitive compared to the other digits',
+    r'Reminder: If the tubing gets compressed or squished during cutting, use a thin round tool \(e\.g\., awl or screwdriver\) to reopen it for tendon passage':
+    'Caution: If the PTFE tubing becomes compressed or deformed during cutting, ream the bore with a thin cylindrical tool (e.g., an awl or precision screwdriver) to ensure unobstructed tendon passage'
+}
+
+
+def get_rules_version(rules=POLISH_RULES):
+    """根据润色规则内容（及缓存格式）计算规则集版本号（规则有任何改动都会得到新版本）"""
+    payload = json.dumps([POLISH_CACHE_FORMAT, list(rules.items())], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def normalize_sentence(text):
+    """规范化句子：仅去除首尾空白作为缓存比对标准（内部空白原样保留，保证与不使用缓存时输出一致）"""
+    return text.strip()
+
+
+def apply_polish_rules(text, rules=POLISH_RULES):
+    """按顺序对文本应用全部润色规则"""
+    for pattern, replacement in rules.items():
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+class PolishCache:
+    """
+    润色结果持久化缓存：
+    1. 以（规范化句子哈希, 规则集版本）为键，保存润色后的输出
+    2. 规则集版本与缓存文件不一致时，整体失效
+    3. 超出条目上限时按LRU淘汰，并统计命中/未命中
+    """
+
+    def __init__(self, cache_path=POLISH_CACHE_FILE, rules=POLISH_RULES,
+                 max_entries=POLISH_CACHE_MAX_ENTRIES):
+        self.cache_path = cache_path
+        self.rules = rules
+        self.rules_version = get_rules_version(rules)
+        self.max_entries = max_entries
+        # dict保持插入顺序：越靠后越是最近使用
+        self.entries = {}
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0, "invalidated": 0}
+        self.load()
+
+    def load(self):
+        """加载缓存文件；文件损坏或规则集版本变化时丢弃旧条目"""
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 润色缓存读取失败，将重新生成：{e}")
+            return
+        entries = data.get("entries", {})
+        if data.get("rules_version") != self.rules_version:
+            self.stats["invalidated"] = len(entries)
+            return
+        self.entries = entries
+
+    def save(self):
+        """写回缓存文件"""
+        data = {"rules_version": self.rules_version, "entries": self.entries}
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def polish_line(self, line):
+        """润色单行文本：命中缓存直接返回，否则应用规则并写入缓存（保留首尾空白）"""
+        sentence = normalize_sentence(line)
+        if not sentence:
+            return line
+        indent = line[:len(line) - len(line.lstrip())]
+        trailing = line[len(line.rstrip()):]
+        key = hashlib.sha256(sentence.encode('utf-8')).hexdigest()
+
+        if key in self.entries:
+            self.stats["hits"] += 1
+            # 移到末尾，标记为最近使用
+            polished = self.entries.pop(key)
+            self.entries[key] = polished
+            return indent + polished + trailing
+
+        self.stats["misses"] += 1
+        polished = apply_polish_rules(sentence, self.rules)
+        self.entries[key] = polished
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+            self.stats["evicted"] += 1
+        return indent + polished + trailing
+
+
+def process_robot_hand_instructions(file_path, first_step=10, last_step=19,
+                                    output_path='processed_instruction10-19.html', use_cache=True, dry_run=False):
     """
     处理机器人灵巧手组装教程文本：
-    1. 按/分割步骤并标注step10-step19
+    1. 按/分割步骤并标注步骤号（默认step10-step19，可通过first_step/last_step扩展至全部30步）
     2. 彻底删除相邻重复行（包含全空白行去重）
-    3. 润色语言使其更专业
+    3. 润色语言使其更专业（逐行缓存，重复运行只处理新增/修改的行）
+    dry_run=True时不写入结果文件和缓存
     """
     # 读取文件内容（保留原始换行符）
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -28,8 +163,8 @@ def process_robot_hand_instructions(file_path):
     # 重新拼接为文本（保留原始换行结构）
     cleaned_content = '\n'.join(cleaned_lines)
     
-    # ========== 步骤标注（step10-step19） ==========
-    step_num = 10
+    # ========== 步骤标注（默认step10-step19） ==========
+    step_num = first_step
     # 分割步骤：处理/前后的任意空白（换行/空格/制表符）
     steps = re.split(r'\s*/\s*', cleaned_content)
     processed_steps = []
@@ -40,63 +175,41 @@ def process_robot_hand_instructions(file_path):
             step_label = f"<!-- Step {step_num} -->"
             processed_steps.append(f"{step_label}\n{step_stripped}")
             step_num += 1
-            if step_num > 19:
-                break  # 仅处理10-19步
+            if step_num > last_step:
+                break  # 仅处理指定范围内的步骤
     
     # 合并步骤（步骤间用空行分隔）
     processed_content = '\n\n'.join(processed_steps)
     
-    # ========== 专业语言润色 ==========
-    polish_rules = {
-        # 拼写错误修正
-        r'scrwews\b': 'screws',
-        r'thay\b': 'they',
-        # 口语化表达→专业表达
-        r'wiggling it around while pushing it in can help': 'gently wiggle and push the tube to facilitate insertion',
-        r'It might be easier to first': 'It is recommended to first',
-        r'Press firmly': 'Apply firm pressure',
-        r'pull them and bring the carpal on to': 'pull the tendons taut and mount the carpal onto',
-        r'significant amount of tension': 'sufficient tension',
-        r'tighten very securely': 'tighten the fastener securely to specification',
-        r'trying to apply tension later will be significantly harder': 'subsequent tension adjustment will be substantially more difficult',
-        # 专业术语标准化
-        r'teflon tubing\b': 'PTFE tubing',
-        r'finger assembly\b': 'finger subassembly',
-        r'carpal holes\b': 'carpal apertures',
-        r'tower holes\b': 'tower bores',
-        r'rod\b': 'guide rod',
-        r'washers\b': 'flat washers',
-        r'groove\b': 'machined groove',
-        r'motor teeth\b': 'motor gear teeth',
-        r'belt\b(?!\s+sanitizer)': 'timing belt',  # 避免误匹配其他belt
-        r'wrist gear\b': 'wrist drive gear',
-        r'bearing covers\b': 'bearing retainer plates',
-        # 关键步骤优化
-        r'Follow the color coding to route the tendons through the carpal holes\. They should not cross each other': 
-        'Route the tendons through the carpal apertures in accordance with the color-coding scheme; ensure no tendon crossover occurs',
-        r'Note: The holes the tendons come out from at the other side of the carpal may appear random due to internal routing':
-        'Note: The exit apertures of the tendons on the distal side of the carpal may appear irregular due to internal routing paths',
-        r'Be extra careful with the routing as it\'s not as straightforward as the other fingers':
-        'Exercise additional caution during tendon routing, as this process is less intuitive compared to the other digits',
-        r'Reminder: If the tubing gets compressed or squished during cutting, use a thin round tool \(e\.g\., awl or screwdriver\) to reopen it for tendon passage':
-        'Caution: If the PTFE tubing becomes compressed or deformed during cutting, ream the bore with a thin cylindrical tool (e.g., an awl or precision screwdriver) to ensure unobstructed tendon passage'
-    }
-    
-    polished_content = processed_content
-    for pattern, replacement in polish_rules.items():
-        polished_content = re.sub(pattern, replacement, polished_content, flags=re.IGNORECASE)
+    # ========== 专业语言润色（逐行缓存） ==========
+    # 润色规则不得跨行匹配（前后查找也只能用同一行内的空白），逐行处理才与整体处理结果一致；
+    # 仅新增/修改的行需要重新润色
+    cache = PolishCache() if use_cache else None
+    polished_lines = []
+    for line in processed_content.split('\n'):
+        if cache:
+            polished_lines.append(cache.polish_line(line))
+        else:
+            polished_lines.append(apply_polish_rules(line))
+    polished_content = '\n'.join(polished_lines)
+    if cache and not dry_run:
+        cache.save()
     
     # ========== 保存结果 ==========
-    output_path = 'processed_instruction10-19.html'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(polished_content)
+    if not dry_run:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(polished_content)
     
     # 验证结果（输出去重前后行数对比）
     original_line_count = len(lines)
     cleaned_line_count = len(cleaned_lines)
     duplicate_count = original_line_count - cleaned_line_count
-    print(f"✅ 处理完成！生成文件：{output_path}")
+    print(f"✅ 处理完成！{'预览模式，未写入' if dry_run else '生成文件：'}{output_path}")
     print(f"📊 去重统计：原始行数 {original_line_count} → 处理后行数 {cleaned_line_count}，删除重复行 {duplicate_count} 行")
+    if cache:
+        stats = cache.stats
+        print(f"📊 润色缓存：命中 {stats['hits']} 行，未命中 {stats['misses']} 行，"
+              f"淘汰 {stats['evicted']} 条，规则变更失效 {stats['invalidated']} 条（规则集版本 {cache.rules_version}）")
     return output_path
 
 # 测试用例（可直接运行验证）
@@ -126,10 +239,35 @@ Image 2"""
     print("\n处理后文本：")
     print(cleaned_text)
 
+def test_polish_cache_consistency():
+    """测试润色缓存：首次（未命中）与再次（命中）的输出都必须与不使用缓存时完全一致"""
+    import tempfile
+    test_lines = [
+        "The  rod   goes\tinto the groove.  ",
+        "    Press firmly on the teflon tubing",
+        "Follow the color coding to route the tendons through the carpal holes. They should not cross each other",
+        "",
+        "   ",
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = PolishCache(cache_path=os.path.join(tmp_dir, "cache.json"))
+        for line in test_lines:
+            expected = apply_polish_rules(line)
+            assert cache.polish_line(line) == expected, f"缓存未命中输出不一致：{line!r}"
+            assert cache.polish_line(line) == expected, f"缓存命中输出不一致：{line!r}"
+
+    # 逐行润色必须与整体润色一致（规则跨行匹配时此处会失败）
+    multi_line_text = "Tighten the belt\nsanitizer\nbelt  sanitizer\nbelt\n  Press firmly\non the rod"
+    per_line = '\n'.join(apply_polish_rules(line) for line in multi_line_text.split('\n'))
+    assert per_line == apply_polish_rules(multi_line_text), "逐行润色与整体润色结果不一致"
+    print("\n=== 润色缓存一致性测试通过 ===")
+
+
 # 执行处理
 if __name__ == "__main__":
-    # 先运行测试用例验证去重功能
+    # 先运行测试用例验证去重功能与缓存一致性
     test_duplicate_removal()
+    test_polish_cache_consistency()
     
     # 处理目标文件
     input_file = "instruction10-19.html"
@@ -0,0 +1,447 @@
+import os
+import re
+import time
+import base64
+import hashlib
+import zipfile
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote
+
+from critical_css import parse_css, dedupe_rules, serialize_css
+
+# ========== 核心路径配置（无需修改） ==========
+PROJECT_ROOT = Path(__file__).parent
+# 导出的步骤页面：根目录下的step00.html~step29.html
+HTML_FILES = [PROJECT_ROOT / f"step{i:02d}.html" for i in range(30)]
+# 本地图标样式（由icon_subset.py生成，存在时内联进离线包）
+ICONS_CSS = PROJECT_ROOT / "assets" / "icons" / "icons.css"
+# 图片重编码缓存目录（隐藏目录，按画质档位分子目录）
+EXPORT_CACHE_DIR = PROJECT_ROOT / ".export_cache"
+# 离线包输出目录
+EXPORT_DIR = PROJECT_ROOT / "export"
+# 页面注释中存在非法UTF-8字节，读写时原样保留
+HTML_ERRORS = "surrogateescape"
+# =============================================
+
+# 画质档位：最长边像素 + JPEG质量；full表示直接使用原图
+QUALITY_TIERS = {
+    "low": {"max_side": 800, "quality": 55},
+    "medium": {"max_side": 1400, "quality": 75},
+    "full": None,
+}
+BUNDLE_FORMATS = ("html", "zip")
+
+IMAGE_SRC_PATTERN = re.compile(r'src="(assets/images/[^"]+)"')
+STYLE_BLOCK_PATTERN = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL)
+# 页面链接的本地样式表（如critical_css.py生成的assets/css/step-*.css）
+LOCAL_CSS_LINK_PATTERN = re.compile(r'<link[^>]*href="(?![a-zA-Z][\w+.-]*:|/)([^"]+\.css)"[^>]*>')
+STEP_LINK_PATTERN = re.compile(r'href="step(\d{2})\.html"')
+INDEX_LINK_PATTERN = re.compile(r'href="index\.html(#[\w-]*)?"')
+FA_CDN_LINK = '<link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet"/>'
+MIME_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".gif": "image/gif",
+              ".woff2": "font/woff2", ".woff": "font/woff"}
+
+# 离线包额外样式：多个步骤纵向排列在同一页面中
+BUNDLE_CSS = """
+.bundle-steps { flex: 1; min-width: 0 }
+.bundle-step + .bundle-step { border-top: 6px solid var(--light-color) }
+"""
+
+# 离线包脚本（所有步骤共用一份）：图片放大、完成标记（与在线页面共用localStorage键）
+BUNDLE_SCRIPT = """
+document.addEventListener('DOMContentLoaded', function() {
+    const modal = document.getElementById('imageModal');
+    const modalImage = modal.querySelector('.modal-image');
+
+    function closeModal() {
+        modal.style.display = 'none';
+        document.body.style.overflow = 'auto';
+    }
+
+    document.querySelectorAll('.step-image').forEach((img) => {
+        img.setAttribute('tabindex', '0');
+        img.addEventListener('click', function() {
+            modalImage.src = this.src;
+            modalImage.alt = this.alt || 'Expanded step image';
+            modal.style.display = 'flex';
+            document.body.style.overflow = 'hidden';
+        });
+    });
+    modal.querySelector('.close-modal').addEventListener('click', closeModal);
+    modal.addEventListener('click', function(event) {
+        if (event.target === modal) closeModal();
+    });
+    document.addEventListener('keydown', function(event) {
+        if (event.key === 'Escape') closeModal();
+    });
+
+    document.querySelectorAll('.completion-btn[data-step]').forEach((btn) => {
+        const key = `step-${btn.dataset.step}-completed`;
+        function render(done) {
+            btn.classList.toggle('completed', done);
+            btn.innerHTML = done
+                ? '<i class="fas fa-check-circle"></i> Completed'
+                : '<i class="far fa-check-circle"></i> Mark as Complete';
+        }
+        try { render(localStorage.getItem(key) === 'true'); } catch (e) { render(false); }
+        btn.addEventListener('click', function() {
+            const done = !btn.classList.contains('completed');
+            try { done ? localStorage.setItem(key, 'true') : localStorage.removeItem(key); } catch (e) {}
+            render(done);
+        });
+    });
+});
+"""
+
+BUNDLE_MODAL = """<div class="modal" id="imageModal">
+   <div class="modal-content">
+    <span class="close-modal">×</span>
+    <img alt="Enlarged view" class="modal-image" src=""/>
+   </div>
+  </div>"""
+
+
+# ===================== 图片重编码（缓存 + 并行） =====================
+def encode_image(source_path: str, output_path: str, max_side: int, quality: int) -> str:
+    """按档位缩放并重编码为JPEG（透明背景铺白），在子进程中执行"""
+    from PIL import Image
+
+    with Image.open(source_path) as img:
+        img.thumbnail((max_side, max_side))
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        tmp_path = output_path + ".tmp"
+        img.save(tmp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def cached_image_path(source: Path, tier: str) -> Path:
+    """缓存文件名：源文件相对路径/大小/修改时间 + 档位参数，任一变化即重新编码"""
+    stat = source.stat()
+    rel_path = source.relative_to(PROJECT_ROOT).as_posix()
+    key = f"{rel_path}|{stat.st_size}|{stat.st_mtime_ns}|{QUALITY_TIERS[tier]}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return EXPORT_CACHE_DIR / tier / f"{source.stem.strip()}_{digest}.jpg"
+
+
+def bundle_image_names(prepared: dict) -> dict:
+    """
+    zip内图片路径：保留assets/images下的相对路径（不同目录的同名图片不会冲突），
+    扩展名与实际文件一致；极端情况下仍冲突时追加路径哈希
+    """
+    names = {}
+    used = set()
+    for rel_path, path in sorted(prepared.items()):
+        sub_path = Path(unquote(rel_path)).relative_to("assets/images").with_suffix(path.suffix)
+        name = f"images/{sub_path.as_posix()}"
+        if name in used:
+            digest = hashlib.sha256(rel_path.encode("utf-8")).hexdigest()[:8]
+            name = f"images/{sub_path.with_name(f'{sub_path.stem}_{digest}{sub_path.suffix}').as_posix()}"
+        used.add(name)
+        names[rel_path] = name
+    return names
+
+
+def prepare_images(image_paths, tier: str, workers=None, dry_run: bool = False) -> tuple:
+    """
+    准备所有图片：full档位直接使用原图；其余档位命中缓存直接复用，
+    未命中的并行重编码（dry_run=True时只统计待编码数量）。返回({相对路径: 输出文件}, 统计信息)
+    """
+    prepared = {}
+    stats = {"images": 0, "cached": 0, "encoded": 0, "pending": 0, "missing": 0}
+    jobs = {}
+    for rel_path in sorted(image_paths):
+        source = PROJECT_ROOT / unquote(rel_path)
+        if not source.exists():
+            print(f"⚠ 图片不存在，已跳过：{rel_path}")
+            stats["missing"] += 1
+            continue
+        stats["images"] += 1
+        if QUALITY_TIERS[tier] is None:
+            prepared[rel_path] = source
+            continue
+        output = cached_image_path(source, tier)
+        prepared[rel_path] = output
+        if output.exists():
+            stats["cached"] += 1
+        else:
+            jobs[rel_path] = (str(source), str(output))
+
+    if dry_run:
+        stats["pending"] = len(jobs)
+        return prepared, stats
+
+    if jobs:
+        (EXPORT_CACHE_DIR / tier).mkdir(parents=True, exist_ok=True)
+        settings = QUALITY_TIERS[tier]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                rel_path: executor.submit(encode_image, src, out, settings["max_side"], settings["quality"])
+                for rel_path, (src, out) in jobs.items()
+            }
+            for rel_path, future in futures.items():
+                try:
+                    future.result()
+                    stats["encoded"] += 1
+                except Exception as e:
+                    print(f"❌ 重编码失败 {rel_path}：{str(e)}")
+                    prepared.pop(rel_path)
+    return prepared, stats
+
+
+def to_data_uri(file_path: Path) -> str:
+    mime = MIME_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
+    return f"data:{mime};base64,{base64.b64encode(file_path.read_bytes()).decode('ascii')}"
+
+
+# ===================== 页面拼装 =====================
+def extract_block(content: str, pattern: str, html_file: Path) -> str:
+    match = re.search(pattern, content, re.DOTALL)
+    if not match:
+        raise ValueError(f"{html_file.name} 中未找到 {pattern}")
+    return match.group(1)
+
+
+def rewrite_links(html: str) -> str:
+    """页面间链接改为离线包内锚点"""
+    html = STEP_LINK_PATTERN.sub(r'href="#step\1"', html)
+    return INDEX_LINK_PATTERN.sub('href="#step00"', html)
+
+
+def build_step_section(html_file: Path, content: str) -> str:
+    """提取单个步骤的正文，包装为离线包中的一节（id加步骤后缀避免冲突）"""
+    step_id = html_file.stem[len("step"):]
+    main = extract_block(content, r'<main class="main-content">(.*?)</main>', html_file)
+    main = re.sub(r'id="(progress-fill|progress-text)"', rf'id="\1-{step_id}"', main)
+    main = main.replace('id="completion-btn"', f'data-step="{step_id}"')
+    return f'<section class="main-content bundle-step" id="step{step_id}">{rewrite_links(main)}</section>'
+
+
+def build_icons_css():
+    """内联本地图标子集（字体转为data URI）；未生成时返回None"""
+    if not ICONS_CSS.exists():
+        return None
+    def inline_font(match):
+        font_path = ICONS_CSS.parent / match.group(1).strip("\"'")
+        return f"url({to_data_uri(font_path)})"
+
+    return re.sub(r'url\(([^)]+)\)', inline_font, ICONS_CSS.read_text(encoding="utf-8"))
+
+
+def collect_page_css(html_file: Path, content: str) -> str:
+    """页面的全部样式：内联<style>块 + 链接的本地样式表（图标样式单独处理）"""
+    css_parts = STYLE_BLOCK_PATTERN.findall(content)
+    # 同一样式表可能同时出现在preload链接与<noscript>回退中，只读取一次
+    for href in dict.fromkeys(LOCAL_CSS_LINK_PATTERN.findall(content)):
+        css_path = (html_file.parent / unquote(href)).resolve()
+        if css_path == ICONS_CSS.resolve():
+            continue
+        if css_path.exists():
+            css_parts.append(css_path.read_text(encoding="utf-8", errors=HTML_ERRORS))
+        else:
+            print(f"⚠ {html_file.name} 链接的样式表不存在：{href}")
+    if not css_parts:
+        raise ValueError(f"{html_file.name} 中未找到任何样式")
+    return "\n".join(css_parts)
+
+
+def build_bundle_html(pages: dict, image_sources: dict) -> str:
+    """拼装离线包HTML：共用的样式/导航/页脚/脚本只出现一次"""
+    first_file, first_content = next(iter(pages.items()))
+
+    # 所有页面的样式合并去重（内容相同的规则只保留一份）
+    rules = []
+    for html_file, content in pages.items():
+        rules.extend(parse_css(collect_page_css(html_file, content)))
+    shared_css = serialize_css(dedupe_rules(rules)[0]) + BUNDLE_CSS
+
+    icons_css = build_icons_css()
+    if icons_css is None:
+        print("⚠ 未找到本地图标样式（可先运行icon_subset.py），图标仍依赖CDN")
+        icons_head = FA_CDN_LINK
+    else:
+        icons_head = f"<style>\n{icons_css}</style>"
+
+    header = rewrite_links(extract_block(first_content, r'(<header class="top-nav">.*?</header>)', first_file))
+    sidebar = extract_block(first_content, r'<!-- Sidebar Navigation -->(.*?)<!-- Main Content Area -->', first_file)
+    sidebar = rewrite_links(sidebar.replace("step-item active", "step-item"))
+    footer = rewrite_links(extract_block(first_content, r'(<footer>.*?</footer>)', first_file))
+    sections = "\n".join(build_step_section(html_file, content) for html_file, content in pages.items())
+
+    body = f"""<!DOCTYPE html>
+<html lang="en">
+ <head>
+  <meta charset="utf-8"/>
+  <meta content="width=device-width, initial-scale=1.0" name="viewport"/>
+  <title>SENS_HAND v1 Dexterous Hand - Offline Assembly Guide</title>
+  {icons_head}
+  <style>
+{shared_css}
+  </style>
+ </head>
+ <body>
+  {header}
+  <div class="container">
+{sidebar}
+   <div class="bundle-steps">
+{sections}
+   </div>
+  </div>
+  {footer}
+  {BUNDLE_MODAL}
+  <script>{BUNDLE_SCRIPT}</script>
+ </body>
+</html>
+"""
+    return IMAGE_SRC_PATTERN.sub(lambda m: f'src="{image_sources.get(m.group(1), m.group(1))}"', body)
+
+
+# ===================== 导出 =====================
+def export_bundle(tier: str = "medium", bundle_format: str = "html", workers=None, dry_run: bool = False):
+    """
+    导出全部步骤为离线包（dry_run=True时只统计，不编码图片也不写入任何文件）：
+    - html：单个自包含HTML（图片以data URI内嵌）
+    - zip：HTML + images/目录（保留原目录结构，每张图片只保存一份）
+    返回统计信息（输出路径、体积、耗时、图片缓存命中），失败返回None
+    """
+    if tier not in QUALITY_TIERS:
+        print(f"❌ 未知画质档位：{tier}（可选：{'/'.join(QUALITY_TIERS)}）")
+        return None
+    if bundle_format not in BUNDLE_FORMATS:
+        print(f"❌ 未知导出格式：{bundle_format}（可选：{'/'.join(BUNDLE_FORMATS)}）")
+        return None
+    if workers is not None and workers < 1:
+        print(f"❌ 并行编码进程数必须为正整数：{workers}")
+        return None
+    if not dry_run and QUALITY_TIERS[tier] is not None and importlib.util.find_spec("PIL") is None:
+        print("❌ 缺少依赖 Pillow，请先执行：pip install pillow（或使用 full 档位）")
+        return None
+
+    start_time = time.perf_counter()
+    pages = {}
+    for html_file in HTML_FILES:
+        if not html_file.exists():
+            print(f"❌ 跳过：文件不存在 {html_file.name}")
+            continue
+        with open(html_file, "r", encoding="utf-8", errors=HTML_ERRORS) as f:
+            pages[html_file] = f.read()
+    if not pages:
+        print("❌ 未找到任何步骤页面")
+        return None
+
+    image_paths = {m for content in pages.values() for m in IMAGE_SRC_PATTERN.findall(content)}
+    prepared, image_stats = prepare_images(image_paths, tier, workers, dry_run=dry_run)
+    print(f"🖼️ 图片：{image_stats['images']} 张（缓存命中 {image_stats['cached']}，"
+          f"新编码 {image_stats['encoded']}，待编码 {image_stats['pending']}，缺失 {image_stats['missing']}）")
+
+    output_path = EXPORT_DIR / f"SENS_HAND_guide_{tier}.{bundle_format}"
+    if dry_run:
+        print(f"🔎 预览模式：将导出 {output_path.relative_to(PROJECT_ROOT)}（{len(pages)} 个步骤），未写入文件")
+        return {
+            "output": str(output_path),
+            "tier": tier,
+            "format": bundle_format,
+            "steps": len(pages),
+            "dry_run": True,
+            **image_stats,
+        }
+
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        if bundle_format == "html":
+            image_sources = {rel: to_data_uri(path) for rel, path in prepared.items()}
+            html = build_bundle_html(pages, image_sources)
+            with open(output_path, "w", encoding="utf-8", errors=HTML_ERRORS) as f:
+                f.write(html)
+        else:
+            image_sources = bundle_image_names(prepared)
+            html = build_bundle_html(pages, image_sources)
+            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as bundle:
+                bundle.writestr("index.html", html.encode("utf-8", HTML_ERRORS))
+                for rel, path in prepared.items():
+                    # 图片已压缩，直接存储
+                    bundle.write(path, image_sources[rel], compress_type=zipfile.ZIP_STORED)
+    except Exception as e:
+        print(f"❌ 导出失败：{str(e)}")
+        return None
+
+    elapsed = time.perf_counter() - start_time
+    size_mb = output_path.stat().st_size / 1024 / 1024
+    print(f"✅ 已导出 {output_path.relative_to(PROJECT_ROOT)}（{len(pages)} 个步骤）")
+    print(f"📊 离线包体积：{size_mb:.1f} MB，耗时 {elapsed:.1f} 秒")
+    return {
+        "output": str(output_path),
+        "tier": tier,
+        "format": bundle_format,
+        "steps": len(pages),
+        "bytes": output_path.stat().st_size,
+        "seconds": round(elapsed, 2),
+        **image_stats,
+    }
+
+
+def positive_int(value: str) -> int:
+    """argparse参数类型：正整数"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须为正整数：{value}")
+    return number
+
+
+def test_encode_image():
+    """测试重编码：缩放到档位尺寸、透明背景铺白、各种颜色模式都输出RGB JPEG且不残留临时文件"""
+    if importlib.util.find_spec("PIL") is None:
+        print("\n=== 未安装Pillow，跳过重编码测试 ===")
+        return
+    import tempfile
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sources = {
+            "rgba.png": Image.new("RGBA", (1200, 600), (255, 0, 0, 0)),
+            "palette.png": Image.new("P", (300, 900)),
+            "gray.png": Image.new("L", (500, 500), 128),
+            "photo.jpg": Image.new("RGB", (2000, 1000), (0, 128, 255)),
+        }
+        for name, img in sources.items():
+            source_path = os.path.join(tmp_dir, name)
+            output_path = os.path.join(tmp_dir, f"out_{name}.jpg")
+            img.save(source_path)
+            assert encode_image(source_path, output_path, 800, 55) == output_path
+            assert not os.path.exists(output_path + ".tmp"), f"残留临时文件：{name}"
+            with Image.open(output_path) as out:
+                assert out.format == "JPEG" and out.mode == "RGB", f"{name}：{out.format} {out.mode}"
+                assert max(out.size) == min(800, max(img.size)), f"{name}：{out.size}"
+                if name == "rgba.png":
+                    # 完全透明的像素铺白，而不是显示为黑色/原色
+                    assert all(channel > 250 for channel in out.getpixel((10, 10))), out.getpixel((10, 10))
+    print("\n=== 图片重编码测试通过 ===")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出全部步骤为离线包")
+    parser.add_argument("--tier", choices=list(QUALITY_TIERS), default="medium", help="图片画质档位")
+    parser.add_argument("--format", dest="bundle_format", choices=BUNDLE_FORMATS, default="html", help="导出格式")
+    parser.add_argument("--workers", type=positive_int, default=None, help="并行编码进程数（默认CPU核数）")
+    parser.add_argument("--dry-run", action="store_true", help="只统计待编码图片，不写入任何文件")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"📌 开始导出离线包（画质：{args.tier}，格式：{args.bundle_format}）")
+    print("=" * 80)
+    export_bundle(args.tier, args.bundle_format, args.workers, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    # 先运行测试用例验证图片重编码
+    test_encode_image()
+    main()
@@ -0,0 +1,192 @@
+"""
+SUSTech_HAND 维护工具统一入口（在项目根目录运行）：
+
+    python hand_cli.py gallery  [--dry-run]                 批量更新step10-19图片（insert.py）
+    python hand_cli.py captions [--yes] [--dry-run]         替换图片<p>说明文本（insert_instruction.py）
+    python hand_cli.py css      [--dry-run]                 批量更新图片自适应样式（selfadjust.py）
+    python hand_cli.py polish   [INPUT] [--no-cache]        润色教程文本（division.py）
+    python hand_cli.py snapshot [--dry-run]                 备份当前文件并检测批量修改（undo.py）
+    python hand_cli.py undo     [--list] [--yes] [--dry-run]  撤销最近一次批量修改（undo.py）
+    python hand_cli.py icons / critical / export            构建本地图标子集/首屏CSS/离线包
+
+所有子命令都支持 --json：提示信息输出到stderr，stdout只输出一行JSON结果；
+失败（含异常、取消操作）时 "ok" 为 false，退出码非0。
+各脚本只在对应子命令执行时才导入（BeautifulSoup/Pillow等重依赖不影响其他命令的启动速度）。
+"""
+import sys
+import json
+import argparse
+from contextlib import redirect_stdout
+
+
+# ===================== 子命令实现（延迟导入） =====================
+# 约定：返回None表示失败；批量处理中有任何文件失败、或用户取消时，返回的dict中 "ok" 为False（结果仍原样输出）
+def cmd_gallery(args):
+    try:
+        import insert
+    except ModuleNotFoundError as e:
+        print(f"❌ 缺少依赖 {e.name}，请先执行：pip install beautifulsoup4")
+        return None
+    result = insert.main(dry_run=args.dry_run)
+    result["ok"] = result["failed"] == 0
+    return result
+
+
+def cmd_captions(args):
+    import insert_instruction
+    files = insert_instruction.replace_target_files(assume_yes=args.yes, dry_run=args.dry_run)
+    # 确认时取消会返回空列表
+    return {"files": files, "cancelled": not files, "ok": bool(files)}
+
+
+def cmd_css(args):
+    import selfadjust
+    result = selfadjust.main(dry_run=args.dry_run)
+    result["ok"] = result["success"] == result["total"]
+    return result
+
+
+def cmd_polish(args):
+    import division
+    try:
+        output_path = division.process_robot_hand_instructions(
+            args.input, first_step=args.first_step, last_step=args.last_step,
+            output_path=args.output, use_cache=not args.no_cache, dry_run=args.dry_run,
+        )
+    except FileNotFoundError:
+        print(f"❌ 错误：未找到文件 {args.input}，请确认文件路径正确")
+        return None
+    return {"output": output_path}
+
+
+def cmd_snapshot(args):
+    import undo
+    return undo.create_snapshot(dry_run=args.dry_run)
+
+
+def cmd_undo(args):
+    import undo
+    if args.list:
+        batches = undo.list_backup_batches()
+        for item in batches:
+            print(f"{item['batch']}  {item['files']} 个文件")
+        return {"batches": batches}
+    result = undo.undo_recent_changes(assume_yes=args.yes, dry_run=args.dry_run)
+    if result is None:
+        return None
+    # 取消或没有恢复任何文件时不算成功（预览模式除外）
+    result["ok"] = result["dry_run"] or (not result["cancelled"] and result["restored"] > 0 and not result["failed"])
+    return result
+
+
+def cmd_icons(args):
+    import icon_subset
+    if args.dry_run:
+        used = icon_subset.scan_used_icons(icon_subset.HTML_FILES)
+        for style, names in used.items():
+            print(f"{style}：{' '.join(sorted(names))}")
+        return {style: sorted(names) for style, names in used.items()}
+    return {"stylesheet": str(icon_subset.ICONS_CSS)} if icon_subset.main() else None
+
+
+def cmd_critical(args):
+    import critical_css
+    pages = critical_css.main(dry_run=args.dry_run)
+    return {"pages": pages, "ok": len(pages) == len(critical_css.HTML_FILES)}
+
+
+def cmd_export(args):
+    import export_bundle
+    return export_bundle.export_bundle(args.tier, args.bundle_format, args.workers, dry_run=args.dry_run)
+
+
+# ===================== 参数解析 =====================
+def positive_int(value):
+    """argparse参数类型：正整数"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须为正整数：{value}")
+    return number
+
+
+def build_parser():
+    # 公共选项：每个子命令都可使用（写在子命令之后）
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="以JSON输出结果（提示信息转到stderr）")
+    common.add_argument("--yes", "-y", action="store_true", help="跳过所有确认提示")
+    common.add_argument("--dry-run", action="store_true", help="只预览，不写入任何文件")
+
+    parser = argparse.ArgumentParser(prog="hand_cli.py", description="SUSTech_HAND 维护工具")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subparsers.required = True
+
+    sub = subparsers.add_parser("gallery", parents=[common], help="批量更新step10-19图片")
+    sub.set_defaults(func=cmd_gallery)
+
+    sub = subparsers.add_parser("captions", parents=[common], help="替换图片<p>说明文本")
+    sub.set_defaults(func=cmd_captions)
+
+    sub = subparsers.add_parser("css", parents=[common], help="批量更新图片自适应样式")
+    sub.set_defaults(func=cmd_css)
+
+    sub = subparsers.add_parser("polish", parents=[common], help="润色教程文本")
+    sub.add_argument("input", nargs="?", default="instruction10-19.html", help="教程原文文件")
+    sub.add_argument("--output", default="processed_instruction10-19.html", help="输出文件")
+    sub.add_argument("--first-step", type=int, default=10)
+    sub.add_argument("--last-step", type=int, default=19)
+    sub.add_argument("--no-cache", action="store_true", help="不使用润色缓存")
+    sub.set_defaults(func=cmd_polish)
+
+    sub = subparsers.add_parser("snapshot", parents=[common], help="备份当前文件并检测批量修改")
+    sub.set_defaults(func=cmd_snapshot)
+
+    sub = subparsers.add_parser("undo", parents=[common], help="撤销最近一次批量修改")
+    sub.add_argument("--list", action="store_true", help="列出所有备份批次")
+    sub.set_defaults(func=cmd_undo)
+
+    sub = subparsers.add_parser("icons", parents=[common], help="生成本地图标子集并改写页面链接")
+    sub.set_defaults(func=cmd_icons)
+
+    sub = subparsers.add_parser("critical", parents=[common], help="内联首屏关键CSS")
+    sub.set_defaults(func=cmd_critical)
+
+    sub = subparsers.add_parser("export", parents=[common], help="导出离线包")
+    sub.add_argument("--tier", choices=["low", "medium", "full"], default="medium", help="图片画质档位")
+    sub.add_argument("--format", dest="bundle_format", choices=["html", "zip"], default="html", help="导出格式")
+    sub.add_argument("--workers", type=positive_int, default=None, help="并行编码进程数（默认CPU核数）")
+    sub.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def is_ok(result):
+    if result is None:
+        return False
+    return not isinstance(result, dict) or result.get("ok", True) is not False
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not args.json:
+        return 0 if is_ok(args.func(args)) else 1
+
+    # JSON模式：各脚本的提示信息转到stderr，stdout只保留结果；任何异常都输出一行失败结果
+    try:
+        with redirect_stdout(sys.stderr):
+            result = args.func(args)
+    except SystemExit as e:
+        result = {"error": f"exit {e.code}"}
+        print(json.dumps({"command": args.command, "ok": False, "result": result}, ensure_ascii=False))
+        return e.code if isinstance(e.code, int) and e.code != 0 else 1
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+        print(json.dumps({"command": args.command, "ok": False, "result": result}, ensure_ascii=False, default=str))
+        return 1
+    ok = is_ok(result)
+    print(json.dumps({"command": args.command, "ok": ok, "result": result}, ensure_ascii=False, default=str))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import os
+import re
+import importlib.util
+import urllib.request
+from pathlib import Path
+
+# ========== 核心路径配置（无需修改） ==========
+PROJECT_ROOT = Path(__file__).parent
+# 需要扫描/改写的页面：根目录页面 + steps/目录页面
+HTML_FILES = sorted(PROJECT_ROOT.glob("*.html")) + sorted((PROJECT_ROOT / "steps").glob("*.html"))
+# 本地图标输出目录（子集字体 + 精简CSS）
+ICONS_DIR = PROJECT_ROOT / "assets" / "icons"
+ICONS_CSS = ICONS_DIR / "icons.css"
+# 页面注释中存在非法UTF-8字节，读写时原样保留，避免改写页面时损坏内容
+HTML_ERRORS = "surrogateescape"
+# Font Awesome源文件缓存目录（隐藏目录，仅首次构建时下载）
+FA_SOURCE_DIR = PROJECT_ROOT / ".fa_source"
+# =============================================
+
+# 与页面中CDN链接保持同一版本
+FA_VERSION = "6.4.0"
+FA_CDN_BASE = f"https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FA_VERSION}"
+# 匹配页面中的Font Awesome CDN样式表地址
+FA_CDN_HREF_PATTERN = re.compile(r'https?://[^"\'>]*font-awesome[^"\'>]*\.css', re.IGNORECASE)
+# 匹配Font Awesome的JS版本（会把<i>替换为内联SVG，绕过本地子集且离线时无法加载），连同所在行一起删除
+FA_CDN_SCRIPT_PATTERN = re.compile(
+    r'[ \t]*<script[^>]*\bsrc\s*=\s*["\']https?://[^"\'>]*font-awesome[^"\'>]*\.js["\'][^>]*>\s*</script>[ \t]*\r?\n?',
+    re.IGNORECASE,
+)
+# 匹配class属性（含JS字符串中的innerHTML片段）
+CLASS_ATTR_PATTERN = re.compile(r'class\s*=\s*(["\'])(.*?)\1', re.DOTALL)
+
+# 三种图标风格：风格类名 → 字体族/字重/字体文件
+FA_STYLES = {
+    "solid": {
+        "classes": ("fas", "fa-solid", "fa"),
+        "family": "Font Awesome 6 Free",
+        "weight": 900,
+        "font": "fa-solid-900",
+    },
+    "regular": {
+        "classes": ("far", "fa-regular"),
+        "family": "Font Awesome 6 Free",
+        "weight": 400,
+        "font": "fa-regular-400",
+    },
+    "brands": {
+        "classes": ("fab", "fa-brands"),
+        "family": "Font Awesome 6 Brands",
+        "weight": 400,
+        "font": "fa-brands-400",
+    },
+}
+STYLE_BY_CLASS = {cls: style for style, info in FA_STYLES.items() for cls in info["classes"]}
+
+
+def fetch_fa_source(rel_path: str) -> Path:
+    """获取Font Awesome源文件（优先使用本地缓存，不存在时从CDN下载一次）"""
+    local_path = FA_SOURCE_DIR / rel_path
+    if local_path.exists():
+        return local_path
+
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    url = f"{FA_CDN_BASE}/{rel_path}"
+    print(f"⬇️ 下载：{url}")
+    with urllib.request.urlopen(url, timeout=30) as response:
+        local_path.write_bytes(response.read())
+    return local_path
+
+
+def load_codepoints(css_text: str) -> dict:
+    """从Font Awesome的all.css中解析图标名 → Unicode码位（含别名）"""
+    codepoints = {}
+    # 6.4.x格式：.fa-house:before,.fa-home:before{content:"\f015"}
+    # 6.5+格式：.fa-house{--fa:"\f015"}
+    rule_pattern = re.compile(r'([^{}]+)\{[^{}]*?(?:content|--fa)\s*:\s*["\']\\([0-9a-fA-F]+)["\']')
+    for selectors, hex_code in rule_pattern.findall(css_text):
+        for selector in selectors.split(","):
+            match = re.fullmatch(r'\s*\.fa-([a-z0-9-]+)(?:::?before)?\s*', selector)
+            if match:
+                codepoints.setdefault(match.group(1), int(hex_code, 16))
+    return codepoints
+
+
+def scan_used_icons(html_files) -> dict:
+    """扫描所有页面用到的图标，按风格分组：{风格: {图标名, ...}}"""
+    used = {style: set() for style in FA_STYLES}
+    for html_file in html_files:
+        with open(html_file, "r", encoding="utf-8", errors=HTML_ERRORS) as f:
+            content = f.read()
+        for _, class_value in CLASS_ATTR_PATTERN.findall(content):
+            tokens = class_value.split()
+            icon_names = [t[3:] for t in tokens if t.startswith("fa-") and t not in STYLE_BY_CLASS]
+            if not icon_names:
+                continue
+            # 没有风格类（fas/far/fab/fa等）的不是图标元素
+            style = next((STYLE_BY_CLASS[t] for t in tokens if t in STYLE_BY_CLASS), None)
+            if style is None:
+                continue
+            used[style].update(icon_names)
+    return used
+
+
+def subset_font(style: str, unicodes: set) -> Path:
+    """按用到的码位生成子集字体（有brotli时输出woff2，否则输出woff）"""
+    from fontTools import subset
+
+    flavor = "woff2" if importlib.util.find_spec("brotli") else "woff"
+    source_path = fetch_fa_source(f"webfonts/{FA_STYLES[style]['font']}.ttf")
+    output_path = ICONS_DIR / f"{FA_STYLES[style]['font']}.{flavor}"
+
+    options = subset.Options()
+    options.flavor = flavor
+    font = subset.load_font(str(source_path), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=sorted(unicodes))
+    subsetter.subset(font)
+    subset.save_font(font, str(output_path), options)
+    font.close()
+
+    original_kb = source_path.stat().st_size / 1024
+    subset_kb = output_path.stat().st_size / 1024
+    print(f"🔤 {style}：{len(unicodes)} 个字形，{original_kb:.1f} KB → {subset_kb:.1f} KB（{output_path.name}）")
+    return output_path
+
+
+def build_icons_css(glyphs: dict, font_files: dict) -> str:
+    """生成精简CSS：@font-face + 基础样式 + 仅包含用到图标的:before规则"""
+    css = [f"/* Font Awesome Free {FA_VERSION} 子集（由icon_subset.py生成，请勿手动修改） */"]
+
+    for style, font_path in font_files.items():
+        info = FA_STYLES[style]
+        flavor = font_path.suffix.lstrip(".")
+        css.append(
+            f'@font-face{{font-family:"{info["family"]}";font-style:normal;font-weight:{info["weight"]};'
+            f'font-display:block;src:url({font_path.name}) format("{flavor}")}}'
+        )
+
+    all_classes = ",".join(f".{cls}" for style in font_files for cls in FA_STYLES[style]["classes"])
+    css.append(
+        f"{all_classes}{{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;"
+        "display:inline-block;font-style:normal;font-variant:normal;line-height:1;text-rendering:auto}"
+    )
+    for style in font_files:
+        info = FA_STYLES[style]
+        selectors = ",".join(f".{cls}" for cls in info["classes"])
+        css.append(f'{selectors}{{font-family:"{info["family"]}";font-weight:{info["weight"]}}}')
+
+    # 同名图标在不同风格下码位相同，规则只输出一次
+    icon_codes = {}
+    for style in font_files:
+        icon_codes.update(glyphs[style])
+    for name in sorted(icon_codes):
+        css.append(f'.fa-{name}:before{{content:"\\{icon_codes[name]:x}"}}')
+
+    return "\n".join(css) + "\n"
+
+
+def rewrite_fa_link(html_file: Path) -> bool:
+    """将页面中的Font Awesome CDN链接替换为本地精简CSS（相对路径），并删除Font Awesome的CDN脚本"""
+    with open(html_file, "r", encoding="utf-8", errors=HTML_ERRORS) as f:
+        content = f.read()
+
+    css_relative_path = os.path.relpath(ICONS_CSS, html_file.parent).replace("\\", "/")
+    updated = FA_CDN_HREF_PATTERN.sub(css_relative_path, content)
+    updated, removed_scripts = FA_CDN_SCRIPT_PATTERN.subn("", updated)
+    # 页面只通过脚本加载图标时，补上本地样式表，保证删除脚本后图标仍能显示
+    if removed_scripts and css_relative_path not in updated:
+        updated = updated.replace("</head>", f'    <link rel="stylesheet" href="{css_relative_path}">\n</head>', 1)
+    if updated == content:
+        return False
+
+    with open(html_file, "w", encoding="utf-8", errors=HTML_ERRORS) as f:
+        f.write(updated)
+    print(f"✅ 已改写链接 {html_file.relative_to(PROJECT_ROOT)} → {css_relative_path}")
+    if removed_scripts:
+        print(f"🧹 已删除 {html_file.relative_to(PROJECT_ROOT)} 中的Font Awesome CDN脚本（{removed_scripts} 处）")
+    return True
+
+
+def main():
+    print("=" * 80)
+    print(f"📌 开始生成本地图标子集（Font Awesome {FA_VERSION}）")
+    print(f"📌 扫描页面：{len(HTML_FILES)} 个")
+    print(f"📌 输出目录：{ICONS_DIR}")
+    print("=" * 80)
+
+    if importlib.util.find_spec("fontTools") is None:
+        print("❌ 缺少依赖 fontTools，请先执行：pip install fonttools brotli")
+        return False
+
+    # 1. 扫描页面中用到的图标
+    used = scan_used_icons(HTML_FILES)
+    used_count = sum(len(names) for names in used.values())
+    print(f"🔍 检测到 {used_count} 个图标（" + "，".join(f"{s} {len(n)}" for s, n in used.items()) + "）")
+
+    # 2. 解析码位，未知图标名给出提示（CDN版本同样无法显示）
+    try:
+        codepoints = load_codepoints(fetch_fa_source("css/all.css").read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"❌ 获取Font Awesome样式表失败：{str(e)}")
+        return False
+    glyphs = {style: {} for style in FA_STYLES}
+    for style, names in used.items():
+        for name in sorted(names):
+            if name in codepoints:
+                glyphs[style][name] = codepoints[name]
+            else:
+                print(f"⚠ 未知图标（Font Awesome {FA_VERSION}中不存在，已跳过）：{style} fa-{name}")
+
+    # 3. 生成子集字体
+    ICONS_DIR.mkdir(parents=True, exist_ok=True)
+    font_files = {}
+    for style, style_glyphs in glyphs.items():
+        if not style_glyphs:
+            continue
+        try:
+            font_files[style] = subset_font(style, set(style_glyphs.values()))
+        except Exception as e:
+            print(f"❌ 生成{style}子集字体失败：{str(e)}")
+            return False
+
+    # 4. 生成精简CSS
+    css_text = build_icons_css(glyphs, font_files)
+    with open(ICONS_CSS, "w", encoding="utf-8") as f:
+        f.write(css_text)
+    print(f"🎨 已生成 {ICONS_CSS.relative_to(PROJECT_ROOT)}（{len(css_text.encode('utf-8')) / 1024:.1f} KB）")
+
+    # 5. 改写所有页面的<link>
+    rewritten_count = sum(1 for html_file in HTML_FILES if rewrite_fa_link(html_file))
+
+    print("=" * 80)
+    print(f"🎉 处理完成！改写 {rewritten_count}/{len(HTML_FILES)} 个页面的图标样式链接")
+    print("=" * 80)
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent  # 脚本所在目录 = HTML文件所在目录
 HTML_TARGET_DIR = PROJECT_ROOT        # HTML文件根目录
 IMAGES_DIR = PROJECT_ROOT / "assets" / "images"  # 图片存储目录
+# 页面注释中存在非法UTF-8字节，读写时原样保留，避免改写页面时损坏内容
+HTML_ERRORS = "surrogateescape"
 # =============================================
 
 # 处理步骤范围（10-19）
@@ -60,12 +62,13 @@ def update_image_attributes(img_tag, img_relative_path: str, step: int, index: i
     force_adaptive_style(img_tag)
 
 
-def update_single_step(step: int) -> bool:
+def update_single_step(step: int, dry_run: bool = False) -> bool:
     """
     处理单个步骤的图片：
     1. 仅更新图片路径/样式，保留所有<p>说明文本
     2. 删多余图片框，新增不足的图片框
     3. 不修改任何非图片相关内容（alert/样式/注释等）
+    dry_run=True时只统计，不写入文件
     """
     # 目标HTML文件路径（step10.html → step19.html）
     step_file = HTML_TARGET_DIR / f"step{step:02d}.html"
@@ -75,7 +78,7 @@ def update_single_step(step: int) -> bool:
 
     # 读取HTML文件（保留所有原有内容）
     try:
-        with open(step_file, "r", encoding="utf-8") as f:
+        with open(step_file, "r", encoding="utf-8", errors=HTML_ERRORS) as f:
             html_content = f.read()
     except Exception as e:
         print(f"❌ 步骤{step}：读取文件失败 → {str(e)}")
@@ -150,8 +153,11 @@ def update_single_step(step: int) -> bool:
         print(f"➕ 步骤{step}：新增 {add_count} 个图片框")
 
     # ========== 写入文件（仅修改图片部分，保留所有原有内容） ==========
+    if dry_run:
+        print(f"🔎 步骤{step}：预览模式，未写入文件\n")
+        return True
     try:
-        with open(step_file, "w", encoding="utf-8") as f:
+        with open(step_file, "w", encoding="utf-8", errors=HTML_ERRORS) as f:
             # 保留HTML结构和缩进，避免格式混乱
             f.write(soup.prettify())
         print(f"✅ 步骤{step}：图片更新完成（保留所有<p>说明文本）\n")
@@ -161,7 +167,7 @@ def update_single_step(step: int) -> bool:
         return False
 
 
-def main():
+def main(dry_run: bool = False):
     """主函数：批量处理10-19步骤的图片"""
     print("="*80)
     print(f"📌 开始处理图片（仅修改图片路径/样式，保留所有说明文本）")
@@ -175,7 +181,7 @@ def main():
 
     # 批量处理10-19步骤
     for step in TARGET_STEPS:
-        if update_single_step(step):
+        if update_single_step(step, dry_run=dry_run):
             success_count += 1
         else:
             fail_count += 1
@@ -187,6 +193,7 @@ def main():
     print(f"❌ 处理失败：{fail_count} 个文件")
     print("📌 说明：仅修改图片相关内容，<p>说明文本/HTML结构均未改动")
     print("="*80)
+    return {"success": success_count, "failed": fail_count}
 
 
 if __name__ == "__main__":
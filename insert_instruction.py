@@ -6,6 +6,8 @@ import sys
 CURRENT_DIR = os.path.abspath(os.path.dirname(__file__))
 TEXT_FILE = os.path.join(CURRENT_DIR, "processed_instruction10-19.html")
 TEMPLATE_FILE = os.path.join(CURRENT_DIR, "step00.html")
+# 页面注释中存在非法UTF-8字节，读写时原样保留，避免改写页面时损坏内容
+HTML_ERRORS = "surrogateescape"
 
 def parse_step_text():
     """解析教程文本，提取Step10-Step19的文本行（保留所有冗余）"""
@@ -18,7 +20,7 @@ def parse_step_text():
         print(f"   当前目录文件：{os.listdir(CURRENT_DIR)}")
         sys.exit(1)
 
-    with open(TEXT_FILE, 'r', encoding='utf-8') as f:
+    with open(TEXT_FILE, 'r', encoding='utf-8', errors=HTML_ERRORS) as f:
         for line in f.readlines():
             line = line.strip()
             if not line:
@@ -66,35 +68,44 @@ def replace_only_p_content(template_html, step_num, step_lines):
     )
     return replaced_html
 
-def replace_target_files():
-    """仅替换<p>文本，直接覆盖当前目录step10-step19.html"""
+def replace_target_files(assume_yes=False, dry_run=False):
+    """
+    仅替换<p>文本，直接覆盖当前目录step10-step19.html
+    assume_yes=True时跳过确认；dry_run=True时只预览，不写入文件
+    返回已处理（或将处理）的文件列表
+    """
     if not os.path.exists(TEMPLATE_FILE):
         print(f"\n❌ 错误：未找到 {os.path.basename(TEMPLATE_FILE)}")
         print(f"   当前目录文件：{os.listdir(CURRENT_DIR)}")
         sys.exit(1)
     
-    with open(TEMPLATE_FILE, 'r', encoding='utf-8') as f:
+    with open(TEMPLATE_FILE, 'r', encoding='utf-8', errors=HTML_ERRORS) as f:
         template_html = f.read()
     
     step_text = parse_step_text()
 
-    print("\n⚠️ 警告：仅替换<p>说明文本，覆盖step10-step19.html")
-    confirm = input("确认执行？(y/n)：")
-    if confirm.lower() != 'y':
-        print("✅ 已取消")
-        sys.exit(0)
+    if not assume_yes and not dry_run:
+        print("\n⚠️ 警告：仅替换<p>说明文本，覆盖step10-step19.html")
+        confirm = input("确认执行？(y/n)：")
+        if confirm.lower() != 'y':
+            print("✅ 已取消")
+            return []
 
-    replaced_count = 0
+    replaced_files = []
     for step_num in range(10, 20):
         target_file = os.path.join(CURRENT_DIR, f'step{step_num}.html')
         current_lines = step_text.get(step_num, [])
         final_html = replace_only_p_content(template_html, step_num, current_lines)
-        with open(target_file, 'w', encoding='utf-8') as f:
-            f.write(final_html)
-        replaced_count += 1
-        print(f"✅ 已替换<p>文本：{target_file}")
+        if dry_run:
+            print(f"🔎 预览：将替换<p>文本：{target_file}")
+        else:
+            with open(target_file, 'w', encoding='utf-8', errors=HTML_ERRORS) as f:
+                f.write(final_html)
+            print(f"✅ 已替换<p>文本：{target_file}")
+        replaced_files.append(target_file)
 
-    print(f"\n🎉 完成！共处理 {replaced_count} 个文件，仅修改<p>文本")
+    print(f"\n🎉 完成！共处理 {len(replaced_files)} 个文件，仅修改<p>文本")
+    return replaced_files
 
 if __name__ == "__main__":
     print("="*70)
@@ -6,6 +6,10 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent
 # 目标HTML文件：根目录下的step00.html~step29.html
 HTML_FILES = [PROJECT_ROOT / f"step{i:02d}.html" for i in range(30)]
+# 页面注释中存在非法UTF-8字节，读写时原样保留，避免改写页面时损坏内容
+HTML_ERRORS = "surrogateescape"
+# 页面内的<style>块（允许带属性）
+STYLE_BLOCK_PATTERN = re.compile(r'(<style[^>]*>.*?)(</style>)', re.DOTALL)
 
 # 要替换的旧CSS（图片自适应相关）
 OLD_CSS_PATTERNS = [
@@ -49,36 +53,42 @@ NEW_CSS = """
 """
 
 
-def update_html_file(file_path):
-    """修改单个HTML文件的图片自适应样式"""
+def update_html_file(file_path, dry_run=False):
+    """修改单个HTML文件的图片自适应样式（dry_run=True时不写入文件）"""
     if not file_path.exists():
         print(f"❌ 跳过：文件不存在 {file_path.name}")
         return False
 
     try:
         # 读取HTML内容
-        with open(file_path, "r", encoding="utf-8") as f:
+        with open(file_path, "r", encoding="utf-8", errors=HTML_ERRORS) as f:
             content = f.read()
     except Exception as e:
         print(f"❌ 读取失败 {file_path.name}：{str(e)}")
         return False
 
+    # 没有<style>时无处插入新样式，不能删除旧样式后当作成功
+    if not STYLE_BLOCK_PATTERN.search(content):
+        print(f"❌ 跳过：{file_path.name} 未找到<style>")
+        return False
+
     # 替换旧CSS为新样式
     # 先删除所有旧样式，再插入新样式
     for pattern in OLD_CSS_PATTERNS:
         content = pattern.sub("", content)
     
     # 将新样式插入到<style>标签内（放在原有CSS之后）
-    content = re.sub(
-        r'(<style>.*?)(</style>)',
+    content = STYLE_BLOCK_PATTERN.sub(
         lambda m: f"{m.group(1)}\n{NEW_CSS}\n{m.group(2)}",
-        content,
-        flags=re.DOTALL
+        content
     )
 
     # 写入修改后的内容
+    if dry_run:
+        print(f"🔎 预览：将更新 {file_path.name}")
+        return True
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
+        with open(file_path, "w", encoding="utf-8", errors=HTML_ERRORS) as f:
             f.write(content)
         print(f"✅ 已更新 {file_path.name}")
         return True
@@ -87,15 +97,16 @@ def update_html_file(file_path):
         return False
 
 
-def main():
+def main(dry_run=False):
     print("===== 开始批量修改图片自适应样式 =====")
     success_count = 0
 
     for html_file in HTML_FILES:
-        if update_html_file(html_file):
+        if update_html_file(html_file, dry_run=dry_run):
             success_count += 1
 
     print(f"\n===== 处理完成：成功更新 {success_count}/{len(HTML_FILES)} 个文件 =====")
+    return {"success": success_count, "total": len(HTML_FILES)}
 
 
 if __name__ == "__main__":
@@ -134,22 +134,41 @@ def load_backup_log(log_path):
             }
     return backup_map
 
-def undo_recent_changes():
-    """撤销最近一次批量修改（恢复备份）"""
+def list_backup_batches():
+    """列出所有备份批次（按时间戳降序），不存在备份目录时返回空列表"""
+    if not os.path.exists(BACKUP_DIR):
+        return []
+    batches = []
+    for name in sorted(os.listdir(BACKUP_DIR), reverse=True):
+        batch_dir = os.path.join(BACKUP_DIR, name)
+        if not os.path.isdir(batch_dir):
+            continue
+        log_path = os.path.join(batch_dir, "backup_log.txt")
+        file_count = 0
+        if os.path.exists(log_path):
+            with open(log_path, 'r', encoding='utf-8') as f:
+                file_count = sum(1 for line in f if line.strip())
+        batches.append({"batch": name, "path": batch_dir, "files": file_count})
+    return batches
+
+def undo_recent_changes(assume_yes=False, dry_run=False):
+    """
+    撤销最近一次批量修改（恢复备份）；assume_yes跳过确认，dry_run只列出将恢复的文件
+    无法撤销时返回None；否则返回结果：
+    {"batch": 批次, "restored": 恢复数, "failed": 失败数, "cancelled": 是否取消, "dry_run": 是否预览}
+    """
     # 1. 检查备份目录
     if not os.path.exists(BACKUP_DIR):
         print("❌ 无备份目录，无法撤销！")
-        return False
+        return None
 
-    # 2. 获取最新的备份批次（按时间戳排序）
-    backup_batches = [d for d in os.listdir(BACKUP_DIR) if os.path.isdir(os.path.join(BACKUP_DIR, d))]
+    # 2. 获取最新的备份批次（按时间戳降序）
+    backup_batches = list_backup_batches()
     if not backup_batches:
         print("❌ 无备份批次，无法撤销！")
-        return False
+        return None
 
-    # 按时间戳降序排序，取最新的批次
-    backup_batches.sort(reverse=True)
-    latest_batch = backup_batches[0]
+    latest_batch = backup_batches[0]["batch"]
     latest_batch_dir = os.path.join(BACKUP_DIR, latest_batch)
     log_path = os.path.join(latest_batch_dir, "backup_log.txt")
 
@@ -157,15 +176,22 @@ def undo_recent_changes():
     backup_map = load_backup_log(log_path)
     if not backup_map:
         print("❌ 备份日志为空，无法撤销！")
-        return False
+        return None
+    result = {"batch": latest_batch, "restored": 0, "failed": 0, "cancelled": False, "dry_run": dry_run}
 
     # 4. 确认撤销操作
     print(f"\n⚠️ 即将撤销最近一次批量修改（备份批次：{latest_batch}）")
     print(f"   共将恢复 {len(backup_map)} 个文件到修改前状态！")
-    confirm = input("   确认撤销？(y/n)：")
-    if confirm.lower() != "y":
-        print("✅ 已取消撤销操作")
-        return True
+    if dry_run:
+        for original_path in backup_map:
+            print(f"🔎 预览：将恢复 {original_path}")
+        return result
+    if not assume_yes:
+        confirm = input("   确认撤销？(y/n)：")
+        if confirm.lower() != "y":
+            print("✅ 已取消撤销操作")
+            result["cancelled"] = True
+            return result
 
     # 5. 恢复文件
     success_count = 0
@@ -185,29 +211,40 @@ def undo_recent_changes():
     print(f"\n📊 撤销完成！")
     print(f"   成功恢复：{success_count} 个文件")
     print(f"   恢复失败：{fail_count} 个文件")
-    return success_count > 0
-
-# ===================== 主逻辑 =====================
-if __name__ == "__main__":
-    print("="*60)
-    print("📌 文件变化检测与撤销工具")
-    print(f"   当前目录：{os.path.abspath('.')}")
-    print(f"   批量修改时间阈值：{BATCH_THRESHOLD}秒（{BATCH_THRESHOLD/60}分钟）")
-    print("="*60)
+    result["restored"] = success_count
+    result["failed"] = fail_count
+    return result
 
+def create_snapshot(dry_run=False):
+    """扫描当前目录并备份全部文件（撤销的基础），返回最近一次批量修改的文件列表等信息"""
     # 1. 扫描当前文件
     print("\n🔍 正在扫描当前目录文件...")
     current_files = scan_current_files()
     print(f"✅ 扫描完成，共检测到 {len(current_files)} 个文件（排除{EXCLUDE_LIST}）")
 
     # 2. 备份当前文件状态（撤销的基础）
-    print("\n📁 正在备份当前文件状态（用于撤销）...")
-    batch_backup_dir = init_backup_dir()
-    backup_log, log_path = backup_files(current_files, batch_backup_dir)
-    print(f"✅ 备份完成，备份日志：{log_path}")
+    log_path = None
+    if dry_run:
+        print("\n🔎 预览模式：跳过备份")
+    else:
+        print("\n📁 正在备份当前文件状态（用于撤销）...")
+        batch_backup_dir = init_backup_dir()
+        backup_log, log_path = backup_files(current_files, batch_backup_dir)
+        print(f"✅ 备份完成，备份日志：{log_path}")
 
     # 3. 检测最近一次批量修改
     batch_files = detect_recent_batch_changes(current_files)
+    return {"files": len(current_files), "backup_log": log_path, "recent_batch": batch_files}
+
+# ===================== 主逻辑 =====================
+if __name__ == "__main__":
+    print("="*60)
+    print("📌 文件变化检测与撤销工具")
+    print(f"   当前目录：{os.path.abspath('.')}")
+    print(f"   批量修改时间阈值：{BATCH_THRESHOLD}秒（{BATCH_THRESHOLD/60}分钟）")
+    print("="*60)
+
+    batch_files = create_snapshot()["recent_batch"]
 
     # 4. 提供撤销选项
     if batch_files: